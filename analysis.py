@@ -1,18 +1,39 @@
 import os
 import re
-import glob
-from typing import List, Optional
-
+import hashlib
+import threading
+from functools import wraps
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Callable, Dict, List, NamedTuple, Optional, Tuple
+
+import numpy as np
 import pandas as pd
+from pandas.api.types import union_categoricals
+import matplotlib
+
+# Charts are only written to PNG, so use the non-interactive backend
+matplotlib.use("Agg")
 import matplotlib.pyplot as plt
 import matplotlib.dates as mdates
-import matplotlib
+
+try:
+    import python_calamine
+except ImportError:  # optional Rust-based reader; openpyxl is used when missing
+    python_calamine = None
+
+try:
+    import polars as pl
+except ImportError:  # optional; aggregation falls back to pandas when missing
+    pl = None
 
 # Font settings for Chinese (prefer macOS fonts)
 matplotlib.rcParams["font.sans-serif"] = ["Heiti TC", "PingFang TC", "STHeiti", "Noto Sans CJK TC", "Arial Unicode MS"]
 matplotlib.rcParams["axes.unicode_minus"] = False
 
 
+ID_COLUMNS: List[str] = ["會所", "大區", "小區"]
+
 NUMERIC_COLUMNS_CANDIDATES: List[str] = [
     "主日",
     "兒童主日",
@@ -25,27 +46,25 @@ NUMERIC_COLUMNS_CANDIDATES: List[str] = [
     "召會生活",
     "新人主日",
     "新人家聚會受訪",
+    # Derived at ingest: 福音出訪 + 家聚會出訪
+    "總出訪",
 ]
 
 
-DATE_PATTERNS = [
-    r"～(\d{4})年(\d{1,2})月(\d{1,2})日",
-    r"-(\d{4})年(\d{1,2})月(\d{1,2})日",
-    r"至(\d{4})年(\d{1,2})月(\d{1,2})日",
-    r"到(\d{4})年(\d{1,2})月(\d{1,2})日",
-    r"(\d{4})年(\d{1,2})月(\d{1,2})日",
-]
+# Accepted filename forms (previously one regex each):
+#   ～YYYY年M月D日, -YYYY年M月D日, 至YYYY年M月D日, 到YYYY年M月D日, YYYY年M月D日
+# The greedy prefix picks the date after the last range separator (the week end);
+# without a separator the first date in the name is used.
+_DATE_RE = re.compile(r"(?:.*[～\-至到])?(\d{4})年(\d{1,2})月(\d{1,2})日")
 
 
 def parse_week_end_date_from_filename(file_path: str) -> Optional[pd.Timestamp]:
     filename = os.path.basename(file_path)
-    for pattern in DATE_PATTERNS:
-        m = re.search(pattern, filename)
-        if m:
-            groups = m.groups()
-            year, month, day = map(int, groups[-3:])
-            return pd.Timestamp(year=year, month=month, day=day)
-    return None
+    m = _DATE_RE.search(filename)
+    if m is None:
+        return None
+    year, month, day = map(int, m.groups())
+    return pd.Timestamp(year=year, month=month, day=day)
 
 
 def _clean_table_headers(df: pd.DataFrame) -> pd.DataFrame:
@@ -56,23 +75,135 @@ def _clean_table_headers(df: pd.DataFrame) -> pd.DataFrame:
 
 
 def _coerce_numeric_columns(df: pd.DataFrame) -> pd.DataFrame:
-    for column_name in NUMERIC_COLUMNS_CANDIDATES:
-        if column_name in df.columns:
-            df[column_name] = pd.to_numeric(df[column_name], errors="coerce").fillna(0)
+    present = [col for col in NUMERIC_COLUMNS_CANDIDATES if col in df.columns]
+    if present:
+        # Counts are non-negative integers, so int32 is lossless and halves memory
+        df[present] = df[present].apply(pd.to_numeric, errors="coerce", downcast="integer").fillna(0).astype("int32")
     return df
 
 
+OPENPYXL_READ_KWARGS = {"read_only": True, "data_only": True, "keep_links": False}
+
+
+def _dedupe_headers(header) -> List[str]:
+    # Mirror pd.read_excel: blank headers become "Unnamed: n", repeats become "name.1", "name.2", ...
+    names: List[str] = []
+    seen = set()
+    for position, value in enumerate(header):
+        base = f"Unnamed: {position}" if value is None or str(value).strip() == "" else str(value)
+        name, counter = base, 0
+        while name in seen:
+            counter += 1
+            name = f"{base}.{counter}"
+        seen.add(name)
+        names.append(name)
+    return names
+
+
+def _read_xlsx_openpyxl(file_path: str) -> pd.DataFrame:
+    from openpyxl import load_workbook
+
+    # Stream raw cell values instead of going through pd.read_excel's per-cell conversion;
+    # everything stays object here and _coerce_numeric_columns types the count columns
+    workbook = load_workbook(file_path, **OPENPYXL_READ_KWARGS)
+    try:
+        # First sheet, as pd.read_excel does; workbook.active is whichever sheet was last selected
+        rows = workbook.worksheets[0].iter_rows(values_only=True)
+        header = next(rows, None)
+        if header is None:
+            return pd.DataFrame()
+        return pd.DataFrame(list(rows), columns=_dedupe_headers(header), dtype=object)
+    finally:
+        workbook.close()
+
+
+def _read_xlsx_calamine(file_path: str) -> pd.DataFrame:
+    # pandas' calamine engine still renames duplicate/blank headers and turns integral floats into ints
+    return pd.read_excel(file_path, engine="calamine")
+
+
+def _read_xlsx(file_path: str) -> pd.DataFrame:
+    if python_calamine is not None:
+        try:
+            return _read_xlsx_calamine(file_path)
+        except Exception:
+            pass
+    return _read_xlsx_openpyxl(file_path)
+
+
+REPORT_CACHE_DIRNAME = ".cache"
+# Bump when the cached frame's columns or dtypes change so stale parses are ignored
+REPORT_CACHE_VERSION = 5
+
+
+def _cache_dir_for(file_path: str) -> str:
+    return os.path.join(os.path.dirname(os.path.abspath(file_path)), REPORT_CACHE_DIRNAME)
+
+
+def _cache_path_for(file_path: str) -> str:
+    # Keyed by (path, mtime, size) so a re-uploaded file with the same name is re-parsed
+    stat = os.stat(file_path)
+    digest = hashlib.sha1(os.path.abspath(file_path).encode("utf-8")).hexdigest()
+    return os.path.join(_cache_dir_for(file_path), f"{digest}-{stat.st_mtime_ns}-{stat.st_size}-v{REPORT_CACHE_VERSION}.parquet")
+
+
+def _read_cached_report(cache_path: str) -> Optional[pd.DataFrame]:
+    if not os.path.exists(cache_path):
+        return None
+    try:
+        return pd.read_parquet(cache_path, engine="pyarrow")
+    except Exception:
+        return None
+
+
+def _write_cached_report(cache_path: str, df: pd.DataFrame) -> None:
+    try:
+        os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+        df.to_parquet(cache_path, engine="pyarrow", compression="zstd", index=False)
+    except Exception as e:
+        print(f"⚠ 無法寫入報表快取: {cache_path} ({e})")
+
+
+def _prune_report_cache(reports_dir: str, file_paths: List[str]) -> None:
+    cache_dir = os.path.join(os.path.abspath(reports_dir), REPORT_CACHE_DIRNAME)
+    if not os.path.isdir(cache_dir):
+        return
+    valid = {os.path.basename(_cache_path_for(path)) for path in file_paths}
+    for name in os.listdir(cache_dir):
+        if name.endswith(".parquet") and name not in valid:
+            try:
+                os.remove(os.path.join(cache_dir, name))
+            except OSError:
+                pass
+
+
+def _id_labels(series: pd.Series) -> pd.Series:
+    # Categories must share one dtype across reports, so ids are always str (missing stays NaN);
+    # integral floats such as numeric 小區 codes read next to blanks become "1", not "1.0"
+    if pd.api.types.is_float_dtype(series) and (series.dropna() % 1 == 0).all():
+        series = series.astype("Int64")
+    return series.astype("string").astype(object).where(series.notna(), np.nan)
+
+
 def read_single_report(file_path: str) -> Optional[pd.DataFrame]:
     week_end_date = parse_week_end_date_from_filename(file_path)
     if week_end_date is None:
         print(f"⚠ 無法從檔名解析日期: {os.path.basename(file_path)}，已略過")
         return None
 
+    cache_path = _cache_path_for(file_path)
+    cached = _read_cached_report(cache_path)
+    if cached is not None:
+        return cached
+
     dataframe: Optional[pd.DataFrame] = None
     ext = os.path.splitext(file_path)[1].lower()
 
     try:
-        dataframe = pd.read_excel(file_path)
+        if ext == ".xlsx":
+            dataframe = _read_xlsx(file_path)
+        else:
+            dataframe = pd.read_excel(file_path)
     except Exception:
         try:
             dataframe = pd.read_html(file_path, header=0)[0]
@@ -100,56 +231,137 @@ def read_single_report(file_path: str) -> Optional[pd.DataFrame]:
         dataframe["會所"] = ""
 
     dataframe = _coerce_numeric_columns(dataframe)
+    if "福音出訪" in dataframe.columns or "家聚會出訪" in dataframe.columns:
+        dataframe["總出訪"] = dataframe.get("福音出訪", 0) + dataframe.get("家聚會出訪", 0)
     dataframe["週末日"] = week_end_date
+    for column_name in ID_COLUMNS:
+        dataframe[column_name] = _id_labels(dataframe[column_name]).astype("category")
 
-    keep_columns = ["會所", "大區", "小區", "週末日"] + [
+    keep_columns = ID_COLUMNS + ["週末日"] + [
         col for col in NUMERIC_COLUMNS_CANDIDATES if col in dataframe.columns
     ]
-    return dataframe[keep_columns]
+    dataframe = dataframe[keep_columns].reset_index(drop=True)
+    _write_cached_report(cache_path, dataframe)
+    return dataframe
 
 
-def _is_summary_text(value: object) -> bool:
-    if not isinstance(value, str):
-        return False
-    return any(keyword in value for keyword in ["總計", "合計", "小計", "總數", "合共", "總和"])
+def _unify_id_categories(frames: List[pd.DataFrame]) -> List[pd.DataFrame]:
+    # concat only keeps a categorical dtype when every frame shares the same categories
+    for column_name in ID_COLUMNS:
+        categories = union_categoricals([df[column_name] for df in frames]).categories
+        for df in frames:
+            df[column_name] = df[column_name].cat.set_categories(categories)
+    return frames
+
+
+SUMMARY_KEYWORDS: List[str] = ["總計", "合計", "小計", "總數", "合共", "總和"]
+_SUMMARY_RE = re.compile("|".join(map(re.escape, SUMMARY_KEYWORDS)))
 
 
 def _remove_summary_rows(df: pd.DataFrame) -> pd.DataFrame:
-    id_cols = [col for col in ["會所", "大區", "小區"] if col in df.columns]
+    id_cols = [col for col in ID_COLUMNS if col in df.columns]
     if not id_cols:
         return df
-    mask_summary = False
+    mask_summary = np.zeros(len(df), dtype=bool)
     for col in id_cols:
-        mask_summary = mask_summary | df[col].apply(_is_summary_text)
-    return df[~mask_summary].copy()
+        mask_summary |= df[col].astype(str).str.contains(_SUMMARY_RE, na=False).to_numpy()
+    return df.loc[~mask_summary]
 
 
-def aggregate_reports(reports_dir: str) -> pd.DataFrame:
-    pattern = os.path.join(reports_dir, "*.xls*")
-    file_paths = sorted(glob.glob(pattern))
-    if not file_paths:
-        raise RuntimeError(f"在資料夾中找不到報表檔案: {reports_dir}")
+def _map_in_processes(func: Callable, items: list, max_workers: int, task_label: str) -> list:
+    if max_workers < 2:
+        return [func(item) for item in items]
+    # Only the pool itself failing falls back; errors raised by func propagate unchanged
+    try:
+        executor = ProcessPoolExecutor(max_workers=max_workers)
+    except OSError as e:
+        print(f"⚠ 平行{task_label}失敗，改為逐一{task_label} ({e})")
+        return [func(item) for item in items]
+    with executor:
+        try:
+            return list(executor.map(func, items))
+        except BrokenProcessPool as e:
+            print(f"⚠ 平行{task_label}失敗，改為逐一{task_label} ({e})")
+    return [func(item) for item in items]
 
-    combined: List[pd.DataFrame] = []
-    processed_count = 0
-    for path in file_paths:
-        report_df = read_single_report(path)
-        if report_df is not None:
-            combined.append(report_df)
-            processed_count += 1
-    if not combined:
-        raise RuntimeError("沒有任何可用的報表資料。")
 
-    all_data = pd.concat(combined, ignore_index=True)
+# Below this many uncached files the process pool start-up costs more than it saves
+PARALLEL_READ_MIN_FILES = 3
+
+
+def _read_reports(file_paths: List[str]) -> List[Optional[pd.DataFrame]]:
+    # Cached reports are cheap Parquet reads, so only fresh parses go to worker processes
+    uncached = [path for path in file_paths if not os.path.exists(_cache_path_for(path))]
+    max_workers = min(os.cpu_count() or 1, len(uncached)) if len(uncached) >= PARALLEL_READ_MIN_FILES else 1
+    parsed = dict(zip(uncached, _map_in_processes(read_single_report, uncached, max_workers, "讀取報表")))
+    return [parsed[path] if path in parsed else read_single_report(path) for path in file_paths]
+
+
+def _combine_reports_pandas(frames: List[pd.DataFrame]) -> pd.DataFrame:
+    all_data = pd.concat(_unify_id_categories(frames), ignore_index=True, copy=False)
 
     # Remove summary rows like 總計/合計/小計 to avoid double counting
     all_data = _remove_summary_rows(all_data)
 
     # Normalize and sort
-    all_data.sort_values("週末日", inplace=True)
+    all_data = all_data.sort_values("週末日")
 
     # Drop potential duplicates per week and id columns
-    all_data = all_data.drop_duplicates(subset=[col for col in ["會所", "大區", "小區", "週末日"] if col in all_data.columns])
+    return all_data.drop_duplicates(subset=[col for col in ID_COLUMNS + ["週末日"] if col in all_data.columns])
+
+
+def _combine_reports_polars(frames: List[pd.DataFrame]) -> pd.DataFrame:
+    # Same pipeline as _combine_reports_pandas, run lazily in Polars; id columns are cast to
+    # plain strings per frame (before concat can fail on mismatched supertypes) and turned
+    # back into categoricals at the pandas boundary
+    lazy = pl.concat(
+        [pl.from_pandas(df).lazy().with_columns(pl.col(ID_COLUMNS).cast(pl.Utf8)) for df in frames],
+        how="diagonal_relaxed",
+    )
+    id_cols = [pl.col(col) for col in ID_COLUMNS]
+    all_data = (
+        lazy.filter(~pl.any_horizontal([col.str.contains(_SUMMARY_RE.pattern).fill_null(False) for col in id_cols]))
+        .sort("週末日", maintain_order=True)
+        .unique(subset=ID_COLUMNS + ["週末日"], keep="first", maintain_order=True)
+        .collect()
+        .to_pandas()
+    )
+    for column_name in ID_COLUMNS:
+        all_data[column_name] = all_data[column_name].astype("category")
+    return all_data
+
+
+REPORT_EXTENSIONS = (".xls", ".xlsx")
+
+
+def _list_report_files(reports_dir: str) -> List[str]:
+    if not os.path.isdir(reports_dir):
+        return []
+    with os.scandir(reports_dir) as entries:
+        return sorted(
+            entry.path
+            for entry in entries
+            if entry.is_file() and not entry.name.startswith(".") and entry.name.lower().endswith(REPORT_EXTENSIONS)
+        )
+
+
+def aggregate_reports(reports_dir: str) -> pd.DataFrame:
+    file_paths = _list_report_files(reports_dir)
+    if not file_paths:
+        raise RuntimeError(f"在資料夾中找不到報表檔案: {reports_dir}")
+
+    # Drop cached parses whose source file was removed or modified
+    _prune_report_cache(reports_dir, file_paths)
+
+    combined: List[pd.DataFrame] = [df for df in _read_reports(file_paths) if df is not None]
+    processed_count = len(combined)
+    if not combined:
+        raise RuntimeError("沒有任何可用的報表資料。")
+
+    if pl is not None:
+        all_data = _combine_reports_polars(combined)
+    else:
+        all_data = _combine_reports_pandas(combined)
 
     unique_weeks = all_data["週末日"].dropna().unique()
     print(f"📦 已讀取 {processed_count}/{len(file_paths)} 份報表；週數: {len(unique_weeks)} ({', '.join(pd.Series(unique_weeks).dt.strftime('%Y/%m/%d'))})")
@@ -166,13 +378,25 @@ def build_region_timeseries(all_reports: pd.DataFrame, region_name: str) -> pd.D
         return pd.DataFrame()
 
     aggregation_columns = [col for col in NUMERIC_COLUMNS_CANDIDATES if col in region_df.columns]
-    ts = region_df.groupby("週末日")[aggregation_columns].sum().sort_index()
+    return region_df.groupby("週末日")[aggregation_columns].sum().sort_index()
+
+
+# One Figure/Axes is reused for every chart instead of building a new canvas each time
+_FIG, _AX = plt.subplots(figsize=(10, 6))
+_FIGURE_LOCK = threading.Lock()
+
 
-    if "福音出訪" in ts.columns or "家聚會出訪" in ts.columns:
-        gospel = ts["福音出訪"] if "福音出訪" in ts.columns else 0
-        home = ts["家聚會出訪"] if "家聚會出訪" in ts.columns else 0
-        ts["總出訪"] = gospel + home
-    return ts
+def _uses_shared_figure(plot_func):
+    @wraps(plot_func)
+    def wrapper(*args, **kwargs):
+        with _FIGURE_LOCK:
+            return plot_func(*args, **kwargs)
+    return wrapper
+
+
+def _reset_axes():
+    _AX.clear()
+    return _AX
 
 
 def _format_date_axis(ax, dates=None):
@@ -185,197 +409,212 @@ def _format_date_axis(ax, dates=None):
     ax.grid(True, alpha=0.3)
 
 
-def _annotate_series(ax, x_index: pd.Index, y_series: pd.Series, fontsize: int = 12):
-    for x, y in zip(x_index, y_series):
-        ax.annotate(
-            f"{int(y)}",
-            (x, y),
-            textcoords="offset points",
-            xytext=(0, 10),
-            ha="center",
-            fontsize=fontsize,
-            bbox=dict(boxstyle="round,pad=0.2", fc="white", ec="none", alpha=0.8),
-            zorder=3,
-            clip_on=False,
-        )
+# Shared by every point label; matplotlib copies the bbox props per Text
+_ANNOTATION_KWARGS = {
+    "textcoords": "offset points",
+    "xytext": (0, 10),
+    "ha": "center",
+    "bbox": {"boxstyle": "round,pad=0.2", "fc": "white", "ec": "none", "alpha": 0.8},
+    "zorder": 3,
+    "clip_on": False,
+}
 
 
-def plot_attendance(region_name: str, ts: pd.DataFrame, output_dir: str) -> None:
-    # Only keep the last 5 weeks for plotting
-    ts = ts.tail(5)
-    plt.figure(figsize=(10, 6))
-    ax = plt.gca()
-
-    columns_to_plot = [
-        ("主日", "當周主日人數", "red", "-"),
-        ("小排", "小排人數", "gold", "-"),
-        ("晨興", "晨興人數", "green", "-"),
-        ("召會生活", "召會生活", "#8e44ad", "-"),
-    ]
+def _annotate_series(ax, xs: np.ndarray, ys: np.ndarray, fontsize: int = 12):
+    labels = map(str, ys.astype(int).tolist())
+    for x, y, label in zip(xs, ys, labels):
+        ax.annotate(label, (x, y), fontsize=fontsize, **_ANNOTATION_KWARGS)
 
-    plotted_any = False
-    for column_key, label_text, color, linestyle in columns_to_plot:
-        if column_key in ts.columns:
-            ax.plot(ts.index, ts[column_key], label=label_text, color=color, linestyle=linestyle, marker="o", markersize=5, linewidth=2)
-            _annotate_series(ax, ts.index, ts[column_key], fontsize=12)
-            plotted_any = True
 
-    if not plotted_any:
-        print(f"⚠ {region_name} 沒有可繪製的出席相關欄位")
-        plt.close()
-        return
+# (column, legend label, colour) for each line of a chart
+_ATTENDANCE_SPECS = [
+    ("主日", "當周主日人數", "red"),
+    ("小排", "小排人數", "gold"),
+    ("晨興", "晨興人數", "green"),
+    ("召會生活", "召會生活", "#8e44ad"),
+]
+_BURDEN_SPECS = [
+    ("禱告", "禱告人數", "#00aaff"),
+    ("總出訪", "總出訪人數", "#0044aa"),
+    ("家聚會受訪", "受訪人數", "#66ccff"),
+]
 
-    ax.set_title(f"{region_name} - 召會生活人數")
-    ax.set_xlabel("日期")
-    ax.set_ylabel("人數")
-    ax.legend(loc="upper left")
-    _format_date_axis(ax, dates=ts.index)
 
-    os.makedirs(output_dir, exist_ok=True)
-    output_path = os.path.join(output_dir, f"{region_name}_attendance.png")
-    plt.tight_layout()
-    plt.savefig(output_path)
-    plt.close()
-    print(f"✅ 已輸出 {output_path}")
+# Sidecar next to each PNG holding the hash of the data it was drawn from
+CHART_HASH_SUFFIX = ".hash"
+# Bump when drawing code (layout, fonts, annotations, dpi, ...) changes so kept PNGs are redrawn
+CHART_CACHE_VERSION = 1
+
+
+def _chart_hash(ts: pd.DataFrame, display_name: str, specs: List[tuple], title: str) -> str:
+    digest = hashlib.blake2b(pd.util.hash_pandas_object(ts, index=True).to_numpy().tobytes())
+    digest.update(repr((CHART_CACHE_VERSION, display_name, list(ts.columns), specs, title)).encode("utf-8"))
+    return digest.hexdigest()
 
 
-def plot_burden(region_name: str, ts: pd.DataFrame, output_dir: str) -> None:
+def _chart_is_current(output_path: str, chart_hash: str) -> bool:
+    if not os.path.exists(output_path):
+        return False
+    try:
+        with open(output_path + CHART_HASH_SUFFIX, "r", encoding="utf-8") as f:
+            return f.read().strip() == chart_hash
+    except OSError:
+        return False
+
+
+@_uses_shared_figure
+def _plot_series(
+    name_parts: List[str],
+    ts: pd.DataFrame,
+    specs: List[tuple],
+    chart_kind: str,
+    title: str,
+    missing_label: str,
+    output_dir: str,
+) -> Optional[str]:
+    display_name = " - ".join(name_parts)
     # Only keep the last 5 weeks for plotting
     ts = ts.tail(5)
-    plt.figure(figsize=(10, 6))
-    ax = plt.gca()
-
-    plotted_any = False
-    if "禱告" in ts.columns:
-        ax.plot(ts.index, ts["禱告"], label="禱告人數", color="#00aaff", marker="o", markersize=5, linewidth=2)
-        _annotate_series(ax, ts.index, ts["禱告"], fontsize=12)
-        plotted_any = True
-    if "總出訪" in ts.columns:
-        ax.plot(ts.index, ts["總出訪"], label="總出訪人數", color="#0044aa", marker="o", markersize=5, linewidth=2)
-        _annotate_series(ax, ts.index, ts["總出訪"], fontsize=12)
-        plotted_any = True
-    if "家聚會受訪" in ts.columns:
-        ax.plot(ts.index, ts["家聚會受訪"], label="受訪人數", color="#66ccff", marker="o", markersize=5, linewidth=2)
-        _annotate_series(ax, ts.index, ts["家聚會受訪"], fontsize=12)
-        plotted_any = True
-
-    if not plotted_any:
-        print(f"⚠ {region_name} 沒有可繪製的負擔相關欄位")
-        plt.close()
-        return
+    available = [spec for spec in specs if spec[0] in ts.columns]
+    if not available:
+        print(f"⚠ {display_name} 沒有可繪製的{missing_label}相關欄位")
+        return None
 
-    ax.set_title(f"{region_name} - 負擔領受程度")
+    os.makedirs(output_dir, exist_ok=True)
+    output_path = os.path.join(output_dir, f"{'_'.join(name_parts)}_{chart_kind}.png")
+    chart_hash = _chart_hash(ts[[spec[0] for spec in available]], display_name, available, title)
+    if _chart_is_current(output_path, chart_hash):
+        print(f"⏭ 資料未變更，沿用 {output_path}")
+        return output_path
+
+    ax = _reset_axes()
+    xs = ts.index.to_numpy()
+    for column_key, label_text, color in available:
+        ys = ts[column_key].to_numpy()
+        ax.plot(xs, ys, label=label_text, color=color, marker="o", markersize=5, linewidth=2)
+        _annotate_series(ax, xs, ys, fontsize=12)
+
+    ax.set_title(f"{display_name} - {title}")
     ax.set_xlabel("日期")
     ax.set_ylabel("人數")
     ax.legend(loc="upper left")
     _format_date_axis(ax, dates=ts.index)
 
-    os.makedirs(output_dir, exist_ok=True)
-    output_path = os.path.join(output_dir, f"{region_name}_burden.png")
-    plt.tight_layout()
-    plt.savefig(output_path)
-    plt.close()
+    _FIG.tight_layout()
+    # Low zlib effort: PNG encoding otherwise dominates the save
+    _FIG.savefig(output_path, dpi=100, pil_kwargs={"compress_level": 1})
+    with open(output_path + CHART_HASH_SUFFIX, "w", encoding="utf-8") as f:
+        f.write(chart_hash)
     print(f"✅ 已輸出 {output_path}")
+    return output_path
 
 
-def plot_subdistrict_attendance(region_name: str, subdistrict_name: str, ts: pd.DataFrame, output_dir: str) -> None:
-    # Only keep the last 5 weeks for plotting
-    ts = ts.tail(5)
-    plt.figure(figsize=(10, 6))
-    ax = plt.gca()
-
-    columns_to_plot = [
-        ("主日", "當周主日人數", "red", "-"),
-        ("小排", "小排人數", "gold", "-"),
-        ("晨興", "晨興人數", "green", "-"),
-        ("召會生活", "召會生活", "#8e44ad", "-"),
-    ]
+def plot_attendance(region_name: str, ts: pd.DataFrame, output_dir: str) -> Optional[str]:
+    return _plot_series([region_name], ts, _ATTENDANCE_SPECS, "attendance", "召會生活人數", "出席", output_dir)
 
-    plotted_any = False
-    for column_key, label_text, color, linestyle in columns_to_plot:
-        if column_key in ts.columns:
-            ax.plot(ts.index, ts[column_key], label=label_text, color=color, linestyle=linestyle, marker="o", markersize=5, linewidth=2)
-            _annotate_series(ax, ts.index, ts[column_key], fontsize=12)
-            plotted_any = True
 
-    if not plotted_any:
-        print(f"⚠ {region_name} - {subdistrict_name} 沒有可繪製的出席相關欄位")
-        plt.close()
-        return
+def plot_burden(region_name: str, ts: pd.DataFrame, output_dir: str) -> Optional[str]:
+    return _plot_series([region_name], ts, _BURDEN_SPECS, "burden", "負擔領受程度", "負擔", output_dir)
 
-    ax.set_title(f"{region_name} - {subdistrict_name} - 召會生活人數")
-    ax.set_xlabel("日期")
-    ax.set_ylabel("人數")
-    ax.legend(loc="upper left")
-    _format_date_axis(ax, dates=ts.index)
 
-    os.makedirs(output_dir, exist_ok=True)
-    output_path = os.path.join(output_dir, f"{region_name}_{subdistrict_name}_attendance.png")
-    plt.tight_layout()
-    plt.savefig(output_path)
-    plt.close()
-    print(f"✅ 已輸出 {output_path}")
+def plot_subdistrict_attendance(region_name: str, subdistrict_name: str, ts: pd.DataFrame, output_dir: str) -> Optional[str]:
+    return _plot_series(
+        [region_name, subdistrict_name], ts, _ATTENDANCE_SPECS, "attendance", "召會生活人數", "出席", output_dir
+    )
 
 
-def plot_subdistrict_burden(region_name: str, subdistrict_name: str, ts: pd.DataFrame, output_dir: str) -> None:
-    # Only keep the last 5 weeks for plotting
-    ts = ts.tail(5)
-    plt.figure(figsize=(10, 6))
-    ax = plt.gca()
-
-    plotted_any = False
-    if "禱告" in ts.columns:
-        ax.plot(ts.index, ts["禱告"], label="禱告人數", color="#00aaff", marker="o", markersize=5, linewidth=2)
-        _annotate_series(ax, ts.index, ts["禱告"], fontsize=12)
-        plotted_any = True
-    if "總出訪" in ts.columns:
-        ax.plot(ts.index, ts["總出訪"], label="總出訪人數", color="#0044aa", marker="o", markersize=5, linewidth=2)
-        _annotate_series(ax, ts.index, ts["總出訪"], fontsize=12)
-        plotted_any = True
-    if "家聚會受訪" in ts.columns:
-        ax.plot(ts.index, ts["家聚會受訪"], label="受訪人數", color="#66ccff", marker="o", markersize=5, linewidth=2)
-        _annotate_series(ax, ts.index, ts["家聚會受訪"], fontsize=12)
-        plotted_any = True
-
-    if not plotted_any:
-        print(f"⚠ {region_name} - {subdistrict_name} 沒有可繪製的負擔相關欄位")
-        plt.close()
-        return
+def plot_subdistrict_burden(region_name: str, subdistrict_name: str, ts: pd.DataFrame, output_dir: str) -> Optional[str]:
+    return _plot_series([region_name, subdistrict_name], ts, _BURDEN_SPECS, "burden", "負擔領受程度", "負擔", output_dir)
 
-    ax.set_title(f"{region_name} - {subdistrict_name} - 負擔領受程度")
-    ax.set_xlabel("日期")
-    ax.set_ylabel("人數")
-    ax.legend(loc="upper left")
-    _format_date_axis(ax, dates=ts.index)
 
-    os.makedirs(output_dir, exist_ok=True)
-    output_path = os.path.join(output_dir, f"{region_name}_{subdistrict_name}_burden.png")
-    plt.tight_layout()
-    plt.savefig(output_path)
-    plt.close()
-    print(f"✅ 已輸出 {output_path}")
+class ReportGroups(NamedTuple):
+    total: pd.DataFrame  # indexed by 週末日
+    region: pd.DataFrame  # indexed by (大區, 週末日)
+    subdistrict: pd.DataFrame  # wide: indexed by 週末日, columns (metric, 大區, 小區)
+
+
+# Sum every region and subdistrict series in one pass; charts slice these with xs
+def group_reports(all_reports: pd.DataFrame) -> ReportGroups:
+    aggregation_columns = [col for col in NUMERIC_COLUMNS_CANDIDATES if col in all_reports.columns]
+    by_subdistrict = (
+        all_reports.groupby(["大區", "小區", "週末日"], observed=True)[aggregation_columns].sum().sort_index()
+    )
+    # Grouped from the raw rows so reports with a blank 小區 still count towards their region
+    region = all_reports.groupby(["大區", "週末日"], observed=True)[aggregation_columns].sum().sort_index()
+    # Same result as pivot_table(index="週末日", columns=["大區", "小區"]), reusing the groupby above
+    subdistrict = by_subdistrict.unstack(["大區", "小區"]).sort_index()
+    total = all_reports.groupby("週末日")[aggregation_columns].sum().sort_index()
+    return ReportGroups(total=total, region=region, subdistrict=subdistrict)
+
+
+def subdistrict_timeseries(groups: ReportGroups, region_name: str, subdistrict_name: str) -> pd.DataFrame:
+    ts = groups.subdistrict.xs((region_name, subdistrict_name), level=["大區", "小區"], axis=1)
+    # The wide frame has NaN for weeks the subdistrict did not report; drop those rows
+    return ts.dropna(how="all").fillna(0).astype("int64")
+
 
+def summarize_timeseries(ts: pd.DataFrame) -> Dict[str, Dict[str, float]]:
+    return {"latest": ts.iloc[-1].to_dict(), "mean": ts.mean().to_dict()}
 
-def generate_region_charts(all_reports: pd.DataFrame, region_name: str, output_dir: str) -> None:
-    ts = build_region_timeseries(all_reports, region_name)
+
+# Latest-week and all-week mean counts per region (plus 總計), ready to be stored as JSON
+def compute_region_stats(groups: ReportGroups) -> Dict[str, Dict[str, Dict[str, float]]]:
+    stats = {}
+    if not groups.total.empty:
+        stats["總計"] = summarize_timeseries(groups.total)
+    for region_name in groups.region.index.get_level_values("大區").unique():
+        stats[str(region_name)] = summarize_timeseries(groups.region.xs(region_name, level="大區"))
+    return stats
+
+
+# A chart to draw: (plot function, positional arguments)
+ChartJob = Tuple[Callable[..., Optional[str]], tuple]
+
+# Below this many charts the process pool start-up costs more than it saves
+PARALLEL_CHART_MIN_JOBS = 4
+
+
+def plan_region_charts(region_name: str, groups: ReportGroups, output_dir: str) -> List[ChartJob]:
+    if region_name == "總計":
+        ts = groups.total
+    elif region_name in groups.region.index.get_level_values("大區"):
+        ts = groups.region.xs(region_name, level="大區")
+    else:
+        ts = pd.DataFrame()
     if ts.empty:
         print(f"⚠ 找不到 {region_name} 的資料，無法繪圖")
-        return
-    plot_attendance(region_name, ts, output_dir)
-    plot_burden(region_name, ts, output_dir)
-
-    region_df = all_reports if region_name == "總計" else all_reports[all_reports["大區"] == region_name]
-    if region_name != "總計" and not region_df.empty and "小區" in region_df.columns:
-        for subdistrict in sorted(region_df["小區"].dropna().unique()):
-            sub_df = region_df[region_df["小區"] == subdistrict]
-            sub_ts = sub_df.groupby("週末日")[NUMERIC_COLUMNS_CANDIDATES].sum().sort_index()
-            if "福音出訪" in sub_ts.columns or "家聚會出訪" in sub_ts.columns:
-                gospel = sub_ts["福音出訪"] if "福音出訪" in sub_ts.columns else 0
-                home = sub_ts["家聚會出訪"] if "家聚會出訪" in sub_ts.columns else 0
-                sub_ts["總出訪"] = gospel + home
+        return []
+    jobs: List[ChartJob] = [
+        (plot_attendance, (region_name, ts, output_dir)),
+        (plot_burden, (region_name, ts, output_dir)),
+    ]
+
+    region_columns = groups.subdistrict.columns
+    if region_name != "總計" and region_name in region_columns.get_level_values("大區"):
+        region_subdistricts = region_columns[region_columns.get_level_values("大區") == region_name]
+        for subdistrict in sorted(region_subdistricts.get_level_values("小區").unique()):
+            sub_ts = subdistrict_timeseries(groups, region_name, subdistrict)
             if not sub_ts.empty:
-                plot_subdistrict_attendance(region_name, str(subdistrict), sub_ts, output_dir)
-                plot_subdistrict_burden(region_name, str(subdistrict), sub_ts, output_dir)
+                jobs.append((plot_subdistrict_attendance, (region_name, str(subdistrict), sub_ts, output_dir)))
+                jobs.append((plot_subdistrict_burden, (region_name, str(subdistrict), sub_ts, output_dir)))
+    return jobs
+
+
+def _run_chart_job(job: ChartJob) -> Optional[str]:
+    plot_func, args = job
+    return plot_func(*args)
+
+
+# Each worker process draws on its own module-level Figure
+def render_charts(jobs: List[ChartJob]) -> List[str]:
+    max_workers = min(os.cpu_count() or 1, len(jobs)) if len(jobs) >= PARALLEL_CHART_MIN_JOBS else 1
+    outputs = _map_in_processes(_run_chart_job, jobs, max_workers, "繪圖")
+    return [path for path in outputs if path is not None]
+
+
+# Returns the PNG paths written or kept (unchanged) for the region and its subdistricts
+def generate_region_charts(region_name: str, groups: ReportGroups, output_dir: str) -> List[str]:
+    return render_charts(plan_region_charts(region_name, groups, output_dir))
 
 
 if __name__ == "__main__":
@@ -385,7 +624,10 @@ if __name__ == "__main__":
 
     df_reports = aggregate_reports(reports_dir)
 
+    report_groups = group_reports(df_reports)
+
     # Ensure '總計' charts are generated correctly
-    generate_region_charts(df_reports, "總計", static_charts_dir)
+    chart_jobs = plan_region_charts("總計", report_groups, static_charts_dir)
     for region in df_reports["大區"].dropna().unique():
-        generate_region_charts(df_reports, str(region), static_charts_dir)
+        chart_jobs += plan_region_charts(str(region), report_groups, static_charts_dir)
+    render_charts(chart_jobs)
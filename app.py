@@ -1,4 +1,4 @@
-from flask import Flask, render_template, request, flash, redirect, url_for, jsonify
+from flask import Flask, render_template, request, flash, redirect, url_for, jsonify, g, has_app_context
 import os
 from werkzeug.utils import secure_filename
 import analysis
@@ -9,7 +9,9 @@ app = Flask(__name__)
 # --- Configuration ---
 # Folder to store uploaded report files
 UPLOAD_FOLDER = 'date'
-DATA_CACHE_PATH = os.path.join(UPLOAD_FOLDER, 'aggregated_data.pkl')
+DATA_CACHE_PATH = os.path.join(UPLOAD_FOLDER, 'aggregated_data.parquet')
+# Written by older versions; still read until the next analysis replaces it
+LEGACY_DATA_CACHE_PATH = os.path.join(UPLOAD_FOLDER, 'aggregated_data.pkl')
 # Secret key for flashing messages (important for security)
 app.config['SECRET_KEY'] = os.environ.get('FLASK_SECRET_KEY', 'a-default-secret-key-for-development-only')
 app.config['UPLOAD_FOLDER'] = UPLOAD_FOLDER
@@ -45,21 +47,124 @@ def save_base_numbers(mapping: dict) -> None:
     with open(BASE_NUMBERS_JSON, 'w', encoding='utf-8') as f:
         json.dump(mapping, f, ensure_ascii=False)
 
+# Latest/mean counts per region, precomputed by run_analysis for /calculate_rates
+REGION_STATS_JSON = os.path.join(UPLOAD_FOLDER, 'region_stats.json')
+
+# --- In-process copies of cache files, reloaded only when the file changes ---
+_FILE_CACHE = {}
+
+def _load_if_changed(path: str, loader):
+    """Return loader(path), re-running it only when the file's mtime changes."""
+    mtime = os.stat(path).st_mtime_ns
+    entry = _FILE_CACHE.get(path)
+    if entry is None or entry[0] != mtime:
+        entry = (mtime, loader(path))
+        _FILE_CACHE[path] = entry
+    return entry[1]
+
+def _read_json(path: str):
+    import json
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+def _data_cache_file():
+    for path in (DATA_CACHE_PATH, LEGACY_DATA_CACHE_PATH):
+        if os.path.exists(path):
+            return path
+    return None
+
+def _get_cached_df():
+    """Return the aggregated DataFrame, re-reading it only when its mtime changes."""
+    path = _data_cache_file()
+    if path is None:
+        return None
+    return _load_if_changed(path, pd.read_parquet if path.endswith('.parquet') else pd.read_pickle)
+
+def _get_region_stats(region: str):
+    """
+    Return {'latest': {...}, 'mean': {...}} for a region ({} if it has no data),
+    or None when no analysis has been run yet.
+    """
+    if os.path.exists(REGION_STATS_JSON):
+        return _load_if_changed(REGION_STATS_JSON, _read_json).get(region, {})
+
+    # Caches written before region stats existed: derive them from the aggregated data
+    df = _get_cached_df()
+    if df is None:
+        return None
+    region_df = df if region == '總計' else df[df['大區'] == region]
+    if region_df.empty:
+        return {}
+    ts = analysis.build_region_timeseries(region_df, region)
+    return analysis.summarize_timeseries(ts) if not ts.empty else {}
+
+def save_region_stats(stats: dict) -> None:
+    """Persist precomputed per-region stats to JSON."""
+    import json
+    os.makedirs(os.path.dirname(REGION_STATS_JSON), exist_ok=True)
+    with open(REGION_STATS_JSON, 'w', encoding='utf-8') as f:
+        json.dump(stats, f, ensure_ascii=False)
+
 @app.context_processor
 def inject_now():
     """Injects a timestamp into templates for cache busting image assets."""
     return {'now': pd.Timestamp.now().timestamp()}
 
+CHART_SUFFIX = '_attendance.png'
+
+
+def _scan_charts(charts_dir: str) -> frozenset:
+    if not os.path.isdir(charts_dir):
+        return frozenset()
+    with os.scandir(charts_dir) as entries:
+        return frozenset(entry.name for entry in entries)
+
+
+def _list_charts(charts_dir: str) -> frozenset:
+    """Lists charts_dir once per request; later lookups are set membership checks."""
+    if not has_app_context():
+        return _scan_charts(charts_dir)
+    listings = g.setdefault('_charts_listing', {})
+    if charts_dir not in listings:
+        listings[charts_dir] = _scan_charts(charts_dir)
+    return listings[charts_dir]
+
+
+def _index_charts(charts_dir: str) -> dict:
+    """Maps each region with an attendance chart to the set of its subdistricts."""
+    if has_app_context():
+        indexes = g.setdefault('_charts_index', {})
+        if charts_dir in indexes:
+            return indexes[charts_dir]
+    index = {}
+    for f in _list_charts(charts_dir):
+        if not f.endswith(CHART_SUFFIX):
+            continue
+        region, _, sub = f[:-len(CHART_SUFFIX)].partition('_')
+        subdistricts = index.setdefault(region, set())
+        if sub:
+            subdistricts.add(sub)
+    if has_app_context():
+        indexes[charts_dir] = index
+    return index
+
+
+def _invalidate_charts_listing() -> None:
+    if has_app_context():
+        g.pop('_charts_listing', None)
+        g.pop('_charts_index', None)
+
+
 def get_regions_and_files(charts_dir: str):
     if not os.path.isdir(charts_dir):
         return [], []
-    files = [f for f in os.listdir(charts_dir) if f.endswith('_attendance.png')]
-    detected = {f.split('_')[0] for f in files}
+    files = [f for f in _list_charts(charts_dir) if f.endswith(CHART_SUFFIX)]
+    detected = set(_index_charts(charts_dir))
 
     # Always include extras
     detected.update({'國中大區', '青年大區'})
 
-    regions = sorted(list(detected))
+    regions = sorted(detected)
 
     # Move '總計' to the front if present; otherwise keep order
     if '總計' in regions:
@@ -69,37 +174,21 @@ def get_regions_and_files(charts_dir: str):
 
 
 def find_subdistricts_for_region(charts_dir: str, region: str):
-    subdistricts = []
-    if not os.path.isdir(charts_dir):
-        return subdistricts
-    suffix = '_attendance.png'
-    prefix = f'{region}_'
-    for f in os.listdir(charts_dir):
-        if not f.endswith(suffix):
-            continue
-        if not f.startswith(prefix):
-            continue
-        if f == f'{region}{suffix}':
-            continue
-        sub = f[len(prefix):-len(suffix)]
-        if sub and sub not in subdistricts:
-            subdistricts.append(sub)
-    return sorted(subdistricts)
+    return sorted(_index_charts(charts_dir).get(region, ()))
 
 
 def build_subdistrict_cards(charts_dir: str, region: str, subdistricts: list):
+    listing = _list_charts(charts_dir)
     cards = []
     for s in subdistricts:
         att = f'charts/{region}_{s}_attendance.png'
         bur = f'charts/{region}_{s}_burden.png'
-        att_path = os.path.join(charts_dir, f'{region}_{s}_attendance.png')
-        bur_path = os.path.join(charts_dir, f'{region}_{s}_burden.png')
         cards.append({
             'name': s,
             'attendance_chart': att,
             'burden_chart': bur,
-            'has_attendance': os.path.exists(att_path),
-            'has_burden': os.path.exists(bur_path),
+            'has_attendance': f'{region}_{s}_attendance.png' in listing,
+            'has_burden': f'{region}_{s}_burden.png' in listing,
         })
     return cards
 
@@ -125,29 +214,45 @@ def run_analysis():
 
         # Save aggregated data to cache for rate calculations
         if not df_reports.empty:
-            df_reports.to_pickle(DATA_CACHE_PATH)
-        elif os.path.exists(DATA_CACHE_PATH):
+            df_reports.to_parquet(DATA_CACHE_PATH, index=False)
+            if os.path.exists(LEGACY_DATA_CACHE_PATH):
+                os.remove(LEGACY_DATA_CACHE_PATH)
+        else:
             # If no data, remove old cache
-            os.remove(DATA_CACHE_PATH)
+            for path in (DATA_CACHE_PATH, LEGACY_DATA_CACHE_PATH, REGION_STATS_JSON):
+                if os.path.exists(path):
+                    os.remove(path)
 
         # 2. Generate charts if data was found
         if not df_reports.empty:
-            # Clear old charts to ensure a clean state
-            if os.path.exists(static_charts_dir):
-                for f in os.listdir(static_charts_dir):
-                    if f.endswith('.png'):
-                        os.remove(os.path.join(static_charts_dir, f))
-            else:
-                os.makedirs(static_charts_dir, exist_ok=True)
-
-            # Generate '總計' (Total) chart
-            analysis.generate_region_charts(df_reports, "總計", static_charts_dir)
-
-            # Generate charts for each unique region found in the data
+            os.makedirs(static_charts_dir, exist_ok=True)
+
+            # Sum all region/subdistrict series once; each chart slices from these
+            report_groups = analysis.group_reports(df_reports)
+
+            # Precompute latest/mean counts so /calculate_rates is a lookup
+            save_region_stats(analysis.compute_region_stats(report_groups))
+
+            # Plan '總計' (Total) charts
+            chart_jobs = analysis.plan_region_charts("總計", report_groups, static_charts_dir)
+
+            # Plan charts for each unique region found in the data
             unique_regions = df_reports["大區"].dropna().unique()
             for region in unique_regions:
                 if str(region) != "總計":
-                    analysis.generate_region_charts(df_reports, str(region), static_charts_dir)
+                    chart_jobs += analysis.plan_region_charts(str(region), report_groups, static_charts_dir)
+
+            # Draw every chart at once so independent charts render in parallel
+            chart_paths = analysis.render_charts(chart_jobs)
+
+            # Remove charts (and their hash sidecars) that no longer belong to any region;
+            # unchanged charts are kept as-is so they are not re-encoded
+            current_charts = {os.path.basename(p) for p in chart_paths}
+            for f in os.listdir(static_charts_dir):
+                chart_name = f[:-len(analysis.CHART_HASH_SUFFIX)] if f.endswith(analysis.CHART_HASH_SUFFIX) else f
+                if chart_name.endswith('.png') and chart_name not in current_charts:
+                    os.remove(os.path.join(static_charts_dir, f))
+            _invalidate_charts_listing()
             return f"分析完成，共處理 {len(df_reports['週末日'].unique())} 週的資料。"
         else:
             return "找不到可分析的報告檔案。"
@@ -178,23 +283,12 @@ def index():
     latest_attendance = {}
     average_attendance = {}
 
-    if os.path.exists(DATA_CACHE_PATH):
-        try:
-            df = pd.read_pickle(DATA_CACHE_PATH)
-            if region == '總計':
-                region_df = df
-            else:
-                region_df = df[df['大區'] == region]
-
-            if not region_df.empty:
-                ts = analysis.build_region_timeseries(region_df, region)
-                if not ts.empty:
-                    latest_data = ts.iloc[-1]
-                    latest_attendance = latest_data.to_dict()
-                    average_data = ts.mean()
-                    average_attendance = average_data.to_dict()
-        except Exception as e:
-            app.logger.error(f"Error reading or processing cache for rates: {e}")
+    try:
+        region_stats = _get_region_stats(region) or {}
+        latest_attendance = region_stats.get('latest', {})
+        average_attendance = region_stats.get('mean', {})
+    except Exception as e:
+        app.logger.error(f"Error reading or processing cache for rates: {e}")
 
     subdistricts = find_subdistricts_for_region(charts_dir, region)
     subdistrict_cards = build_subdistrict_cards(charts_dir, region, subdistricts)
@@ -255,8 +349,9 @@ def region_data():
     burden_chart_path = f'charts/{region}_burden.png'
 
     # Check if charts exist
-    has_attendance_chart = os.path.exists(os.path.join(app.static_folder, attendance_chart_path))
-    has_burden_chart = os.path.exists(os.path.join(app.static_folder, burden_chart_path))
+    listing = _list_charts(charts_dir)
+    has_attendance_chart = f'{region}_attendance.png' in listing
+    has_burden_chart = f'{region}_burden.png' in listing
 
     # Find subdistricts and build cards
     subdistricts = find_subdistricts_for_region(charts_dir, region)
@@ -322,22 +417,16 @@ def calculate_rates():
     else:
         base_number = load_base_numbers(100).get(region, 100)
 
-    if not os.path.exists(DATA_CACHE_PATH):
+    if not os.path.exists(REGION_STATS_JSON) and _data_cache_file() is None:
         return jsonify({'status': 'error', 'message': '找不到彙整後的資料，請先執行分析。'}), 404
 
     try:
-        df = pd.read_pickle(DATA_CACHE_PATH)
-        region_df = df if region == '總計' else df[df['大區'] == region]
-
-        if region_df.empty:
-            return jsonify({'status': 'success', 'rates': {}})
-
-        ts = analysis.build_region_timeseries(region_df, region)
-        if ts.empty:
+        region_stats = _get_region_stats(region)
+        if not region_stats:
             return jsonify({'status': 'success', 'rates': {}})
 
-        latest_data = ts.iloc[-1].to_dict()
-        average_data = ts.mean().to_dict()
+        latest_data = region_stats['latest']
+        average_data = region_stats['mean']
 
         rates = {}
         metrics = ['主日', '小排', '晨興', '禱告']